@@ -17,6 +17,8 @@ import (
 	srv "github.com/featureform/proto"
 	"go.uber.org/zap"
 	"google.golang.org/grpc"
+	"google.golang.org/grpc/codes"
+	"google.golang.org/grpc/status"
 )
 
 type ApiServer struct {
@@ -627,6 +629,53 @@ func (serv *MetadataServer) CreateTrainingSetVariant(ctx context.Context, train
 	return serv.meta.CreateTrainingSetVariant(ctx, train)
 }
 
+func (serv *MetadataServer) CreateResourceStream(stream pb.Api_CreateResourceStreamServer) error {
+	for {
+		envelope, err := stream.Recv()
+		if err == io.EOF {
+			return nil
+		}
+		if err != nil {
+			return err
+		}
+		ack := &pb.ResourceAck{}
+		if err := serv.createResource(stream.Context(), envelope); err != nil {
+			if status.Code(err) != codes.AlreadyExists {
+				return err
+			}
+			ack.AlreadyExists = true
+		}
+		if err := stream.Send(ack); err != nil {
+			return err
+		}
+	}
+}
+
+func (serv *MetadataServer) createResource(ctx context.Context, envelope *pb.ResourceEnvelope) error {
+	var err error
+	switch res := envelope.Resource.(type) {
+	case *pb.ResourceEnvelope_User:
+		_, err = serv.CreateUser(ctx, res.User)
+	case *pb.ResourceEnvelope_Provider:
+		_, err = serv.CreateProvider(ctx, res.Provider)
+	case *pb.ResourceEnvelope_SourceVariant:
+		_, err = serv.CreateSourceVariant(ctx, res.SourceVariant)
+	case *pb.ResourceEnvelope_Entity:
+		_, err = serv.CreateEntity(ctx, res.Entity)
+	case *pb.ResourceEnvelope_FeatureVariant:
+		_, err = serv.CreateFeatureVariant(ctx, res.FeatureVariant)
+	case *pb.ResourceEnvelope_LabelVariant:
+		_, err = serv.CreateLabelVariant(ctx, res.LabelVariant)
+	case *pb.ResourceEnvelope_TrainingSetVariant:
+		_, err = serv.CreateTrainingSetVariant(ctx, res.TrainingSetVariant)
+	case *pb.ResourceEnvelope_ScheduleChange:
+		_, err = serv.RequestScheduleChange(ctx, res.ScheduleChange)
+	default:
+		err = status.Errorf(codes.InvalidArgument, "unknown resource type: %T", res)
+	}
+	return err
+}
+
 func (serv *OnlineServer) FeatureServe(ctx context.Context, req *srv.FeatureServeRequest) (*srv.FeatureRow, error) {
 	serv.Logger.Infow("Serving Features", "request", req.String())
 	return serv.client.FeatureServe(ctx, req)
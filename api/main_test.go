@@ -0,0 +1,109 @@
+package main
+
+import (
+	"context"
+	"errors"
+	"io"
+	"testing"
+
+	pb "github.com/featureform/metadata/proto"
+	"go.uber.org/zap"
+	"google.golang.org/grpc"
+	"google.golang.org/grpc/codes"
+	"google.golang.org/grpc/status"
+)
+
+type fakeMetadataClient struct {
+	pb.MetadataClient
+	userErr error
+}
+
+func (client *fakeMetadataClient) CreateUser(ctx context.Context, in *pb.User, opts ...grpc.CallOption) (*pb.Empty, error) {
+	return &pb.Empty{}, client.userErr
+}
+
+type fakeResourceStream struct {
+	grpc.ServerStream
+	envelopes []*pb.ResourceEnvelope
+	acks      []*pb.ResourceAck
+}
+
+func (stream *fakeResourceStream) Context() context.Context {
+	return context.Background()
+}
+
+func (stream *fakeResourceStream) Recv() (*pb.ResourceEnvelope, error) {
+	if len(stream.envelopes) == 0 {
+		return nil, io.EOF
+	}
+	envelope := stream.envelopes[0]
+	stream.envelopes = stream.envelopes[1:]
+	return envelope, nil
+}
+
+func (stream *fakeResourceStream) Send(ack *pb.ResourceAck) error {
+	stream.acks = append(stream.acks, ack)
+	return nil
+}
+
+func newTestMetadataServer(userErr error) *MetadataServer {
+	return &MetadataServer{
+		Logger: zap.NewNop().Sugar(),
+		meta:   &fakeMetadataClient{userErr: userErr},
+	}
+}
+
+func userEnvelope(name string) *pb.ResourceEnvelope {
+	return &pb.ResourceEnvelope{Resource: &pb.ResourceEnvelope_User{User: &pb.User{Name: name}}}
+}
+
+func TestCreateResourceStreamAcks(t *testing.T) {
+	serv := newTestMetadataServer(nil)
+	stream := &fakeResourceStream{envelopes: []*pb.ResourceEnvelope{userEnvelope("a"), userEnvelope("b")}}
+	if err := serv.CreateResourceStream(stream); err != nil {
+		t.Fatalf("Failed to stream resources: %v", err)
+	}
+	if len(stream.acks) != 2 {
+		t.Fatalf("Expected 2 acks, got %d", len(stream.acks))
+	}
+	for _, ack := range stream.acks {
+		if ack.AlreadyExists {
+			t.Fatalf("Expected new resource ack, got %v", ack)
+		}
+	}
+}
+
+func TestCreateResourceStreamAlreadyExists(t *testing.T) {
+	serv := newTestMetadataServer(status.Error(codes.AlreadyExists, "user exists"))
+	stream := &fakeResourceStream{envelopes: []*pb.ResourceEnvelope{userEnvelope("a")}}
+	if err := serv.CreateResourceStream(stream); err != nil {
+		t.Fatalf("AlreadyExists should not end the stream: %v", err)
+	}
+	if len(stream.acks) != 1 || !stream.acks[0].AlreadyExists {
+		t.Fatalf("Expected one already_exists ack, got %v", stream.acks)
+	}
+}
+
+func TestCreateResourceStreamError(t *testing.T) {
+	createErr := errors.New("create failed")
+	serv := newTestMetadataServer(createErr)
+	stream := &fakeResourceStream{envelopes: []*pb.ResourceEnvelope{userEnvelope("a"), userEnvelope("b")}}
+	if err := serv.CreateResourceStream(stream); err != createErr {
+		t.Fatalf("Expected %v, got %v", createErr, err)
+	}
+	if len(stream.acks) != 0 {
+		t.Fatalf("Expected no acks after an error, got %v", stream.acks)
+	}
+}
+
+func TestCreateResourceUnknownType(t *testing.T) {
+	serv := newTestMetadataServer(nil)
+	err := serv.createResource(context.Background(), &pb.ResourceEnvelope{})
+	if status.Code(err) != codes.InvalidArgument {
+		t.Fatalf("Expected InvalidArgument, got %v", err)
+	}
+	stream := &fakeResourceStream{envelopes: []*pb.ResourceEnvelope{{}}}
+	if err := serv.CreateResourceStream(stream); status.Code(err) != codes.InvalidArgument {
+		t.Fatalf("Expected InvalidArgument from stream, got %v", err)
+	}
+}
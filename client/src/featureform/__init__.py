@@ -1,3 +1,19 @@
+import os
+from importlib.util import find_spec
+
+
+def _has_cpp_protobuf():
+    try:
+        return find_spec("google.protobuf.pyext._message") is not None
+    except ImportError:
+        return False
+
+
+# Use protobuf's C++ backend when it's installed, unless the user picked one.
+# This has to run before any featureform.proto module is imported.
+if "PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION" not in os.environ and _has_cpp_protobuf():
+    os.environ["PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION"] = "cpp"
+
 from .register import *
 from .serving import Client as servClient
 
@@ -1,9 +1,8 @@
 from featureform.proto import metadata_pb2
-import grpc
-from featureform.proto import metadata_pb2_grpc as ff_grpc
 from .format import *
 
 def get_user_info(stub, name):
+    import grpc
     searchName = metadata_pb2.Name(name=name)
     try:
         for user in stub.GetUsers(iter([searchName])):
@@ -28,6 +27,7 @@ def get_user_info(stub, name):
         print("User not found.")
 
 def get_entity_info(stub, name):
+    import grpc
     searchName = metadata_pb2.Name(name=name)
     try:
         for x in stub.GetEntities(iter([searchName])):
@@ -50,6 +50,7 @@ def get_entity_info(stub, name):
         print("Entity not found.")
 
 def get_resource_info(stub, resource_type, name):
+    import grpc
     stub_get_functions = {
         "feature": stub.GetFeatures,
         "label": stub.GetLabels,
@@ -75,6 +76,7 @@ def get_resource_info(stub, resource_type, name):
         print(f"{resource_type} not found.")
 
 def get_feature_variant_info(stub, name, variant):
+    import grpc
     searchNameVariant = metadata_pb2.NameVariant(name=name, variant=variant)
     try:
         for x in stub.GetFeatureVariants(iter([searchNameVariant])):
@@ -99,6 +101,7 @@ def get_feature_variant_info(stub, name, variant):
         print("Feature variant not found.")
 
 def get_label_variant_info(stub, name, variant):
+    import grpc
     searchNameVariant = metadata_pb2.NameVariant(name=name, variant=variant)
     try:
         for x in stub.GetLabelVariants(iter([searchNameVariant])):
@@ -122,6 +125,7 @@ def get_label_variant_info(stub, name, variant):
         print("Label variant not found.")
 
 def get_source_variant_info(stub, name, variant):
+    import grpc
     searchNameVariant = metadata_pb2.NameVariant(name=name, variant=variant)
     try:
         for x in stub.GetSourceVariants(iter([searchNameVariant])):
@@ -159,6 +163,7 @@ def get_source_variant_info(stub, name, variant):
         print("Source variant not found.")
 
 def get_training_set_variant_info(stub, name, variant):
+    import grpc
     searchNameVariant = metadata_pb2.NameVariant(name=name, variant=variant)
     try:
         for x in stub.GetTrainingSetVariants(iter([searchNameVariant])):
@@ -180,6 +185,7 @@ def get_training_set_variant_info(stub, name, variant):
         print("Training set variant not found.")
 
 def get_provider_info(stub, name):
+    import grpc
     searchName = metadata_pb2.Name(name=name)
     try:
         for x in stub.GetProviders(iter([searchName])):
@@ -12,12 +12,10 @@ from .resources import ResourceState, Provider, RedisConfig, FirestoreConfig, Ca
     EntityReference, SourceReference
 from typing import Tuple, Callable, List, Union
 from typeguard import typechecked, check_type
-import grpc
 import os
 from featureform.proto import metadata_pb2
-from featureform.proto import metadata_pb2_grpc as ff_grpc
 from .sqlite_metadata import SQLiteMetadata
-from .tls import insecure_channel, secure_channel
+from .tls import insecure_channel, secure_channel, ChannelPool
 import time
 import pandas as pd
 from .get import *
@@ -1418,7 +1416,7 @@ class Client(Registrar):
     ```
     """
 
-    def __init__(self, host=None, local=False, insecure=False, cert_path=None):
+    def __init__(self, host=None, local=False, insecure=False, cert_path=None, pool_size=4):
         """Initialise a Resource Client object.
 
         Args:
@@ -1426,9 +1424,11 @@ class Client(Registrar):
             local (bool): If localmode is being used
             insecure (bool): If true, do not do TLS verification
             cert_path (str): Path to certificate
+            pool_size (int): Number of channels opened to the host for apply()
         """
         super().__init__()
         self._stub = None
+        self._stub_pool = None
         self.local = local
         if local and host:
             raise ValueError("Cannot be local and have a host")
@@ -1439,11 +1439,14 @@ class Client(Registrar):
                     'If not in local mode then `host` must be passed or the environment'
                     ' variable FEATUREFORM_HOST must be set.'
                 )
+            # Imported here so local mode never loads gRPC.
+            from featureform.proto import metadata_pb2_grpc as ff_grpc
             if insecure:
-                channel = insecure_channel(host)
+                make_channel = lambda options: insecure_channel(host, options)
             else:
-                channel = secure_channel(host, cert_path)
-            self._stub = ff_grpc.ApiStub(channel)
+                make_channel = lambda options: secure_channel(host, cert_path, options)
+            self._stub_pool = ChannelPool(make_channel, ff_grpc.ApiStub, pool_size)
+            self._stub = self._stub_pool.next()
         elif local:
             self.register_user("default_user").make_default_owner()
 
@@ -1454,7 +1457,7 @@ class Client(Registrar):
         if self.local:
             state().create_all_local()
         else:
-            state().create_all(self._stub)
+            state().create_all(self._stub_pool)
 
     def get_user(self, name, local=False):
         """Get a user. Prints out name of user, and all resources associated with the user.
@@ -2,29 +2,134 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+import os
+import sys
 import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from typing import List, Tuple, Union
-from typeguard import typechecked
-from dataclasses import dataclass
+from dataclasses import FrozenInstanceError, dataclass, field, fields
+from functools import lru_cache, wraps
 from featureform.proto import metadata_pb2 as pb
-import grpc
 import json
+import msgpack
 
 from .sqlite_metadata import SQLiteMetadata
 from enum import Enum
 
+# Runtime type checking is skipped under `python -O` or when
+# FEATUREFORM_NO_TYPECHECK is enabled, so production pushes don't pay for it.
+_NO_TYPECHECK = os.environ.get("FEATUREFORM_NO_TYPECHECK", "").lower() in ("1", "true", "yes")
+if sys.flags.optimize or _NO_TYPECHECK:
+    def typechecked(func=None, **kwargs):
+        return func if callable(func) else (lambda f: f)
+else:
+    from typeguard import typechecked
+
+def _json_dumps(obj) -> bytes:
+    return bytes(json.dumps(obj), "utf-8")
+
+# orjson is an optional speedup (pip install featureform[orjson]). It rejects
+# some values json accepts, such as ints wider than 64 bits, so those fall back.
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        try:
+            return orjson.dumps(obj)
+        except orjson.JSONEncodeError:
+            return _json_dumps(obj)
+except ImportError:
+    _dumps = _json_dumps
+
+
+def _memoize_serialized(serialize):
+    # Configs are frozen, so the bytes are stored on the instance the first
+    # time they're built and reused on every later call.
+    @wraps(serialize)
+    def wrapper(self):
+        try:
+            return self._serialized
+        except AttributeError:
+            serialized = serialize(self)
+            object.__setattr__(self, "_serialized", serialized)
+            return serialized
+    return wrapper
+
+
+def _slotted(*extra):
+    """Rebuild a dataclass with __slots__ for its fields plus `extra`.
+
+    This is dataclass(slots=True) for the Python versions we support that
+    predate it, so instances carry no per-instance __dict__.
+    """
+    def decorator(cls):
+        names = tuple(f.name for f in fields(cls))
+        cls_dict = {k: v for k, v in cls.__dict__.items() if k not in names}
+        cls_dict.pop("__dict__", None)
+        cls_dict.pop("__weakref__", None)
+        cls_dict["__slots__"] = names + extra
+
+        # The default slot pickling restores with setattr, which frozen
+        # dataclasses reject.
+        def __getstate__(self):
+            return [getattr(self, name) for name in names]
+
+        def __setstate__(self, state):
+            for name, value in zip(names, state):
+                object.__setattr__(self, name, value)
+
+        cls_dict["__getstate__"] = __getstate__
+        cls_dict["__setstate__"] = __setstate__
+
+        # The generated frozen __setattr__/__delattr__ call super() on the
+        # class being replaced, which fails for the rebuilt one.
+        if cls.__dataclass_params__.frozen:
+            def __setattr__(self, name, value):
+                raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+            def __delattr__(self, name):
+                raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+            cls_dict["__setattr__"] = __setattr__
+            cls_dict["__delattr__"] = __delattr__
+        return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    return decorator
+
 NameVariant = Tuple[str, str]
 
+# Creation and sort order of resource types; resources only depend on types
+# at or before their own.
+_RES_ORDER = {
+    "user": 0,
+    "provider": 1,
+    "source": 2,
+    "entity": 3,
+    "feature": 4,
+    "label": 5,
+    "training-set": 6,
+    "schedule": 7,
+}
+
+
+# Shared pb.NameVariant/pb.Name messages for names referenced by many
+# resources. Protobuf copies them into the parent message, so callers must
+# treat the returned messages as read-only.
+@lru_cache(maxsize=4096)
+def _nv(name, variant):
+    return pb.NameVariant(name=name, variant=variant)
+
+
+@lru_cache(maxsize=4096)
+def _name(name):
+    return pb.Name(name=name)
+
+
 @typechecked
 @dataclass
 class OperationType(Enum):
     GET = 0
     CREATE = 1
 
-@typechecked
-def valid_name_variant(nvar: NameVariant) -> bool:
-    return nvar[0] != "" and nvar[1] != ""
-
 @typechecked
 @dataclass
 class Schedule:
@@ -33,19 +138,21 @@ class Schedule:
     resource_type: int
     schedule_string: str
 
-    @staticmethod
-    def operation_type() -> OperationType:
-        return OperationType.CREATE
+    _OP_TYPE = OperationType.CREATE
+    _TYPE_NAME = "schedule"
 
     def type(self) -> str:
-        return "schedule"
+        return self._TYPE_NAME
+
+    def _proto(self) -> pb.ScheduleChangeRequest:
+        return pb.ScheduleChangeRequest(resource_id=pb.ResourceID(resource=_nv(self.name, self.variant), resource_type=self.resource_type), schedule=self.schedule_string)
 
     def _create(self, stub) -> None:
-        serialized = pb.SetScheduleChangeRequest(resource=pb.ResourceId(pb.NameVariant(name=self.name, variant=self.variant), resource_type=self.resource_type), schedule=self.schedule_string)
-        stub.RequestScheduleChange(serialized)
+        stub.RequestScheduleChange(self._proto())
 
 @typechecked
-@dataclass
+@_slotted("_serialized")
+@dataclass(frozen=True)
 class RedisConfig:
     host: str
     port: int
@@ -58,16 +165,18 @@ class RedisConfig:
     def type(self) -> str:
         return "REDIS_ONLINE"
 
+    @_memoize_serialized
     def serialize(self) -> bytes:
         config = {
             "Addr": f"{self.host}:{self.port}",
             "Password": self.password,
             "DB": self.db,
         }
-        return bytes(json.dumps(config), "utf-8")
+        return _dumps(config)
 
 @typechecked
-@dataclass
+@_slotted("_serialized")
+@dataclass(frozen=True)
 class FirestoreConfig:
     collection: str
     project_id: str
@@ -79,16 +188,18 @@ class FirestoreConfig:
     def type(self) -> str:
         return "FIRESTORE_ONLINE"
 
+    @_memoize_serialized
     def serialize(self) -> bytes:
         config = {
             "Collection": self.collection,
             "ProjectID": self.project_id,
             "Credentials": json.load(open(self.credentials_path)),
         }
-        return bytes(json.dumps(config), "utf-8")
+        return _dumps(config)
 
 @typechecked
-@dataclass
+@_slotted("_serialized")
+@dataclass(frozen=True)
 class CassandraConfig:
     keyspace: str
     host: str
@@ -104,6 +215,7 @@ class CassandraConfig:
     def type(self) -> str:
         return "CASSANDRA_ONLINE"
 
+    @_memoize_serialized
     def serialize(self) -> bytes:
         config = {
             "Keyspace": self.keyspace,
@@ -113,10 +225,11 @@ class CassandraConfig:
             "Consistency": self.consistency,
             "Replication": self.replication
         }
-        return bytes(json.dumps(config), "utf-8")
+        return _dumps(config)
 
 @typechecked
-@dataclass
+@_slotted("_serialized")
+@dataclass(frozen=True)
 class DynamodbConfig:
     region: str
     access_key: str
@@ -128,16 +241,18 @@ class DynamodbConfig:
     def type(self) -> str:
         return "DYNAMODB_ONLINE"
 
+    @_memoize_serialized
     def serialize(self) -> bytes:
         config = {
             "Region": self.region,
             "AccessKey": self.access_key,
             "SecretKey": self.secret_key
         }
-        return bytes(json.dumps(config), "utf-8")
+        return _dumps(config)
 
 @typechecked
-@dataclass
+@_slotted()
+@dataclass(frozen=True)
 class LocalConfig:
 
     def software(self) -> str:
@@ -147,12 +262,12 @@ class LocalConfig:
         return "LOCAL_ONLINE"
 
     def serialize(self) -> bytes:
-        config = {
-        }
-        return bytes(json.dumps(config), "utf-8")
+        # Local mode has no settings, so its config is always an empty object.
+        return b"{}"
         
 @typechecked
-@dataclass
+@_slotted("_serialized")
+@dataclass(frozen=True)
 class SnowflakeConfig:
     account: str
     database: str
@@ -167,6 +282,7 @@ class SnowflakeConfig:
     def type(self) -> str:
         return "SNOWFLAKE_OFFLINE"
 
+    @_memoize_serialized
     def serialize(self) -> bytes:
         config = {
             "Username": self.username,
@@ -175,11 +291,12 @@ class SnowflakeConfig:
             "Account": self.account,
             "Database": self.database,
         }
-        return bytes(json.dumps(config), "utf-8")
+        return _dumps(config)
 
 
 @typechecked
-@dataclass
+@_slotted("_serialized")
+@dataclass(frozen=True)
 class PostgresConfig:
     host: str
     port: str
@@ -193,6 +310,7 @@ class PostgresConfig:
     def type(self) -> str:
         return "POSTGRES_OFFLINE"
 
+    @_memoize_serialized
     def serialize(self) -> bytes:
         config = {
             "Host": self.host,
@@ -201,11 +319,12 @@ class PostgresConfig:
             "Password": self.password,
             "Database": self.database,
         }
-        return bytes(json.dumps(config), "utf-8")
+        return _dumps(config)
 
 
 @typechecked
-@dataclass
+@_slotted("_serialized")
+@dataclass(frozen=True)
 class RedshiftConfig:
     host: str
     port: str
@@ -219,6 +338,7 @@ class RedshiftConfig:
     def type(self) -> str:
         return "REDSHIFT_OFFLINE"
 
+    @_memoize_serialized
     def serialize(self) -> bytes:
         config = {
             "Host": self.host,
@@ -227,11 +347,12 @@ class RedshiftConfig:
             "Password": self.password,
             "Database": self.database,
         }
-        return bytes(json.dumps(config), "utf-8")
+        return _dumps(config)
 
 
 @typechecked
-@dataclass
+@_slotted("_serialized")
+@dataclass(frozen=True)
 class BigQueryConfig:
     project_id: str
     dataset_id: str
@@ -243,18 +364,20 @@ class BigQueryConfig:
     def type(self) -> str:
         return "BIGQUERY_OFFLINE"
 
+    @_memoize_serialized
     def serialize(self) -> bytes:
         config = {
             "ProjectId": self.project_id,
             "DatasetId": self.dataset_id,
             "Credentials": json.load(open(self.credentials_path)),
         }
-        return bytes(json.dumps(config), "utf-8")
+        return _dumps(config)
 
 
 Config = Union[RedisConfig, SnowflakeConfig, PostgresConfig, RedshiftConfig, LocalConfig, BigQueryConfig]
 
 @typechecked
+@_slotted("_ts")
 @dataclass
 class Provider:
     name: str
@@ -262,65 +385,62 @@ class Provider:
     config: Config
     description: str
     team: str
+    software: str = field(init=False)
 
     def __post_init__(self):
         self.software = self.config.software()
 
-    @staticmethod
-    def operation_type() -> OperationType:
-        return OperationType.CREATE
+    _OP_TYPE = OperationType.CREATE
+    _TYPE_NAME = "provider"
 
-    @staticmethod
-    def type() -> str:
-        return "provider"
+    def type(self) -> str:
+        return self._TYPE_NAME
 
-    def _create(self, stub) -> None:
-        serialized = pb.Provider(
+    def _proto(self) -> pb.Provider:
+        config = self.config
+        return pb.Provider(
             name=self.name,
             description=self.description,
-            type=self.config.type(),
-            software=self.config.software(),
+            type=config.type(),
+            software=self.software,
             team=self.team,
-            serialized_config=self.config.serialize(),
+            serialized_config=config.serialize(),
         )
-        stub.CreateProvider(serialized)
+
+    def _create(self, stub) -> None:
+        stub.CreateProvider(self._proto())
 
     def _create_local(self, db) -> None:
+        config = self.config
         db.insert("providers",
                   self.name,
                   "Provider",
                   self.description,
-                  self.config.type(),
-                  self.config.software(),
+                  config.type(),
+                  self.software,
                   self.team,
                   "sources",
                   "ready",
-                  str(self.config.serialize(), 'utf-8')
+                  str(config.serialize(), 'utf-8')
                   )
 
-    def __eq__(self, other):
-        for attribute in vars(self):
-            if getattr(self, attribute) != getattr(other, attribute):
-                return False
-        return True
-
-
 
 @typechecked
 @dataclass
 class User:
     name: str
 
-    @staticmethod
-    def operation_type() -> OperationType:
-        return OperationType.CREATE
+    _OP_TYPE = OperationType.CREATE
+    _TYPE_NAME = "user"
 
     def type(self) -> str:
-        return "user"
+        return self._TYPE_NAME
+
+    def _proto(self) -> pb.User:
+        return pb.User(name=self.name)
 
     def _create(self, stub) -> None:
-        serialized = pb.User(name=self.name)
-        stub.CreateUser(serialized)
+        stub.CreateUser(self._proto())
 
     def _create_local(self, db) -> None:
         db.insert("users",
@@ -329,12 +449,6 @@ class User:
                   "ready"
                   )
 
-    def __eq__(self, other):
-        for attribute in vars(self):
-            if getattr(self, attribute) != getattr(other, attribute):
-                return False
-        return True
-
 
 @typechecked
 @dataclass
@@ -400,6 +514,7 @@ SourceDefinition = Union[PrimaryData, Transformation]
 
 
 @typechecked
+@_slotted("_ts")
 @dataclass
 class Source:
     name: str
@@ -410,24 +525,20 @@ class Source:
     variant: str = "default"
     schedule: str = ""
     schedule_obj: Schedule = None
-    is_transformation = 0
-    inputs = []
 
     def update_schedule(self, schedule) -> None:
         self.schedule_obj = Schedule(name=self.name, variant=self.variant, resource_type=7, schedule_string=schedule)
         self.schedule = schedule
 
-    @staticmethod
-    def operation_type() -> OperationType:
-        return OperationType.CREATE
+    _OP_TYPE = OperationType.CREATE
+    _TYPE_NAME = "source"
 
-    @staticmethod
-    def type() -> str:
-        return "source"
+    def type(self) -> str:
+        return self._TYPE_NAME
 
-    def _create(self, stub) -> None:
+    def _proto(self) -> pb.SourceVariant:
         defArgs = self.definition.kwargs()
-        serialized = pb.SourceVariant(
+        return pb.SourceVariant(
             name=self.name,
             variant=self.variant,
             owner=self.owner,
@@ -436,17 +547,21 @@ class Source:
             provider=self.provider,
             **defArgs,
         )
-        stub.CreateSourceVariant(serialized)
+
+    def _create(self, stub) -> None:
+        stub.CreateSourceVariant(self._proto())
 
     def _create_local(self, db) -> None:
+        is_transformation = 0
+        inputs = []
         if type(self.definition) == DFTransformation:
-            self.is_transformation = 1
-            self.inputs = self.definition.inputs
+            is_transformation = 1
+            inputs = self.definition.inputs
             self.definition = self.definition.query
         if type(self.definition) == PrimaryData:
             self.definition = self.definition.name()
         db.insert_source("source_variant",
-                         str(time.time()),
+                         self._ts,
                          self.description,
                          self.name,
                          "Source",
@@ -454,8 +569,8 @@ class Source:
                          self.provider,
                          self.variant,
                          "ready",
-                         self.is_transformation,
-                         json.dumps(self.inputs),
+                         is_transformation,
+                         msgpack.packb(inputs, use_bin_type=True),
                          self.definition
                          )
         self._create_source_resource(db)
@@ -468,12 +583,6 @@ class Source:
             self.name
         )
 
-    def __eq__(self, other):
-        for attribute in vars(self):
-            if getattr(self, attribute) != getattr(other, attribute):
-                return False
-        return True
-
 
 @typechecked
 @dataclass
@@ -481,20 +590,20 @@ class Entity:
     name: str
     description: str
 
-    @staticmethod
-    def operation_type() -> OperationType:
-        return OperationType.CREATE
+    _OP_TYPE = OperationType.CREATE
+    _TYPE_NAME = "entity"
 
-    @staticmethod
-    def type() -> str:
-        return "entity"
+    def type(self) -> str:
+        return self._TYPE_NAME
 
-    def _create(self, stub) -> None:
-        serialized = pb.Entity(
+    def _proto(self) -> pb.Entity:
+        return pb.Entity(
             name=self.name,
             description=self.description,
         )
-        stub.CreateEntity(serialized)
+
+    def _create(self, stub) -> None:
+        stub.CreateEntity(self._proto())
 
     def _create_local(self, db) -> None:
         db.insert("entities",
@@ -504,32 +613,35 @@ class Entity:
                   "ready"
                   )
 
-    def __eq__(self, other):
-        for attribute in vars(self):
-            if getattr(self, attribute) != getattr(other, attribute):
-                return False
-        return True
-
 
 @typechecked
-@dataclass
+@_slotted("_proto")
+@dataclass(frozen=True)
 class ResourceColumnMapping:
     entity: str
     value: str
     timestamp: str
 
     def proto(self) -> pb.Columns:
-        return pb.Columns(
-            entity=self.entity,
-            value=self.value,
-            ts=self.timestamp,
-        )
+        # Built once; the mapping is frozen and callers pass the message into
+        # constructors, which copy it.
+        try:
+            return self._proto
+        except AttributeError:
+            columns = pb.Columns(
+                entity=self.entity,
+                value=self.value,
+                ts=self.timestamp,
+            )
+            object.__setattr__(self, "_proto", columns)
+            return columns
 
 
 ResourceLocation = ResourceColumnMapping
 
 
 @typechecked
+@_slotted("_ts")
 @dataclass
 class Feature:
     name: str
@@ -548,22 +660,17 @@ class Feature:
         self.schedule_obj = Schedule(name=self.name, variant=self.variant, resource_type=4, schedule_string=schedule)
         self.schedule = schedule
 
-    @staticmethod
-    def operation_type() -> OperationType:
-        return OperationType.CREATE
+    _OP_TYPE = OperationType.CREATE
+    _TYPE_NAME = "feature"
 
-    @staticmethod
-    def type() -> str:
-        return "feature"
+    def type(self) -> str:
+        return self._TYPE_NAME
 
-    def _create(self, stub) -> None:
-        serialized = pb.FeatureVariant(
+    def _proto(self) -> pb.FeatureVariant:
+        return pb.FeatureVariant(
             name=self.name,
             variant=self.variant,
-            source=pb.NameVariant(
-                name=self.source[0],
-                variant=self.source[1],
-            ),
+            source=_nv(self.source[0], self.source[1]),
             type=self.value_type,
             entity=self.entity,
             owner=self.owner,
@@ -572,11 +679,13 @@ class Feature:
             provider=self.provider,
             columns=self.location.proto(),
         )
-        stub.CreateFeatureVariant(serialized)
+
+    def _create(self, stub) -> None:
+        stub.CreateFeatureVariant(self._proto())
 
     def _create_local(self, db) -> None:
         db.insert("feature_variant",
-                  str(time.time()),
+                  self._ts,
                   self.description,
                   self.entity,
                   self.name,
@@ -601,14 +710,9 @@ class Feature:
             self.value_type
         )
 
-    def __eq__(self, other):
-        for attribute in vars(self):
-            if getattr(self, attribute) != getattr(other, attribute):
-                return False
-        return True
-
 
 @typechecked
+@_slotted("_ts")
 @dataclass
 class Label:
     name: str
@@ -621,33 +725,30 @@ class Label:
     location: ResourceLocation
     variant: str = "default"
 
-    @staticmethod
-    def operation_type() -> OperationType:
-        return OperationType.CREATE
+    _OP_TYPE = OperationType.CREATE
+    _TYPE_NAME = "label"
 
-    @staticmethod
-    def type() -> str:
-        return "label"
+    def type(self) -> str:
+        return self._TYPE_NAME
 
-    def _create(self, stub) -> None:
-        serialized = pb.LabelVariant(
+    def _proto(self) -> pb.LabelVariant:
+        return pb.LabelVariant(
             name=self.name,
             variant=self.variant,
-            source=pb.NameVariant(
-                name=self.source[0],
-                variant=self.source[1],
-            ),
+            source=_nv(self.source[0], self.source[1]),
             type=self.value_type,
             entity=self.entity,
             owner=self.owner,
             description=self.description,
             columns=self.location.proto(),
         )
-        stub.CreateLabelVariant(serialized)
+
+    def _create(self, stub) -> None:
+        stub.CreateLabelVariant(self._proto())
 
     def _create_local(self, db) -> None:
         db.insert("label_variant",
-                  str(time.time()),
+                  self._ts,
                   self.description,
                   self.entity,
                   self.name,
@@ -672,11 +773,22 @@ class Label:
             self.name
         )
 
-    def __eq__(self, other):
-        for attribute in vars(self):
-            if getattr(self, attribute) != getattr(other, attribute):
-                return False
-        return True
+def _get_references(stub, refs) -> None:
+    # refs share one reference type and are looked up over a single stream.
+    # The server answers each request in order and ends the stream at the
+    # first name it cannot find.
+    import grpc
+    found = 0
+    responses = getattr(stub, refs[0]._GET_RPC)(ref._request() for ref in refs)
+    try:
+        for obj in responses:
+            refs[found].obj = obj
+            found += 1
+    except grpc.RpcError:
+        if found == len(refs):
+            raise
+        raise ValueError(refs[found]._missing())
+
 
 @typechecked
 @dataclass
@@ -684,21 +796,22 @@ class EntityReference:
     name: str
     obj: Union[Entity, None]
 
-    @staticmethod
-    def operation_type() -> OperationType:
-        return OperationType.GET
+    _OP_TYPE = OperationType.GET
+    _TYPE_NAME = "entity"
 
-    @staticmethod
-    def type() -> str:
-        return "entity"
+    def type(self) -> str:
+        return self._TYPE_NAME
+
+    _GET_RPC = "GetEntities"
+
+    def _request(self):
+        return _name(self.name)
+
+    def _missing(self) -> str:
+        return f"Entity {self.name} not found."
 
     def _get(self, stub):
-        entityList = stub.GetEntities(iter([pb.Name(name=self.name)]))
-        try:
-            for entity in entityList:
-                self.obj = entity
-        except grpc._channel._MultiThreadedRendezvous:
-            raise ValueError(f"Entity {self.name} not found.")
+        _get_references(stub, [self])
     
     def _get_local(self, db):
         local_entity = db.query_resource("entities", "name", self.name)
@@ -713,21 +826,22 @@ class ProviderReference:
     provider_type: str
     obj: Union[Provider, None]
 
-    @staticmethod
-    def operation_type() -> OperationType:
-        return OperationType.GET
+    _OP_TYPE = OperationType.GET
+    _TYPE_NAME = "provider"
 
-    @staticmethod
-    def type() -> str:
-        return "provider"
+    def type(self) -> str:
+        return self._TYPE_NAME
+
+    _GET_RPC = "GetProviders"
+
+    def _request(self):
+        return _name(self.name)
+
+    def _missing(self) -> str:
+        return f"Provider {self.name} of type {self.provider_type} not found."
 
     def _get(self, stub):
-        providerList = stub.GetProviders(iter([pb.Name(name=self.name)]))
-        try:
-            for provider in providerList:
-                self.obj = provider
-        except grpc._channel._MultiThreadedRendezvous:
-            raise ValueError(f"Provider {self.name} of type {self.provider_type} not found.")
+        _get_references(stub, [self])
         
     def _get_local(self, db):
         local_provider = db.query_resource("providers", "name", self.name)
@@ -742,21 +856,22 @@ class SourceReference:
     variant: str
     obj: Union[Source, None]
 
-    @staticmethod
-    def operation_type() -> OperationType:
-        return OperationType.GET
+    _OP_TYPE = OperationType.GET
+    _TYPE_NAME = "source"
 
-    @staticmethod
-    def type() -> str:
-        return "source"
+    def type(self) -> str:
+        return self._TYPE_NAME
+
+    _GET_RPC = "GetSourceVariants"
+
+    def _request(self):
+        return _nv(self.name, self.variant)
+
+    def _missing(self) -> str:
+        return f"Source {self.name}, variant {self.variant} not found."
 
     def _get(self, stub):
-        sourceList = stub.GetSourceVariants(iter([pb.NameVariant(name=self.name, variant=self.variant)]))
-        try:
-            for source in sourceList:
-                self.obj = source
-        except grpc._channel._MultiThreadedRendezvous:
-            raise ValueError(f"Source {self.name}, variant {self.variant} not found.")
+        _get_references(stub, [self])
     
     def _get_local(self, db):
         local_source = db.get_source_variant(self.name, self.variant)
@@ -765,6 +880,7 @@ class SourceReference:
         self.obj = local_source
 
 @typechecked
+@_slotted("_ts")
 @dataclass
 class TrainingSet:
     name: str
@@ -781,40 +897,40 @@ class TrainingSet:
         self.schedule = schedule
 
     def __post_init__(self):
-        if not valid_name_variant(self.label):
+        if not (self.label[0] and self.label[1]):
             raise ValueError("Label must be set")
         if len(self.features) == 0:
             raise ValueError("A training-set must have atleast one feature")
-        for feature in self.features:
-            if not valid_name_variant(feature):
-                raise ValueError("Invalid Feature")
+        if any(not (f[0] and f[1]) for f in self.features):
+            raise ValueError("Invalid Feature")
 
-    @staticmethod
-    def operation_type() -> OperationType:
-        return OperationType.CREATE
+    _OP_TYPE = OperationType.CREATE
+    _TYPE_NAME = "training-set"
 
-    @staticmethod
-    def type() -> str:
-        return "training-set"
+    def type(self) -> str:
+        return self._TYPE_NAME
 
-    def _create(self, stub) -> None:
+    def _proto(self) -> pb.TrainingSetVariant:
         serialized = pb.TrainingSetVariant(
             name=self.name,
             variant=self.variant,
             description=self.description,
             schedule=self.schedule,
             owner=self.owner,
-            features=[
-                pb.NameVariant(name=v[0], variant=v[1]) for v in self.features
-            ],
-            label=pb.NameVariant(name=self.label[0], variant=self.label[1]),
+            label=_nv(self.label[0], self.label[1]),
         )
-        stub.CreateTrainingSetVariant(serialized)
+        features = serialized.features
+        for name, variant in self.features:
+            features.add(name=name, variant=variant)
+        return serialized
+
+    def _create(self, stub) -> None:
+        stub.CreateTrainingSetVariant(self._proto())
 
     def _create_local(self, db) -> None:
         self._check_insert_training_set_resources(db)   
         db.insert("training_set_variant",
-                  str(time.time()),
+                  self._ts,
                   self.description,
                   self.name,
                   self.owner,
@@ -843,19 +959,11 @@ class TrainingSet:
                 db.get_feature_variant(feature_name, feature_variant)
             except ValueError:
                 raise ValueError(f"{feature_name} does not exist. Failed to register training set")
-            db.insert(
-                "training_set_features",
-                self.name,
-                self.variant,
-                feature_name,  # feature name
-                feature_variant # feature variant
-            )
-
-    def __eq__(self, other):
-        for attribute in vars(self):
-            if getattr(self, attribute) != getattr(other, attribute):
-                return False
-        return True
+        db.insert_many(
+            "training_set_features",
+            ((self.name, self.variant, feature_name, feature_variant)
+             for feature_name, feature_variant in self.features)
+        )
 
 
 Resource = Union[PrimaryData, Provider, Entity, User, Feature, Label,
@@ -869,82 +977,183 @@ class ResourceRedefinedError(Exception):
             resource, 'variant') else ""
         resourceId = f"{resource.name}{variantStr}"
         super().__init__(
-            f"{resource.type()} resource {resourceId} defined in multiple places"
+            f"{resource._TYPE_NAME} resource {resourceId} defined in multiple places"
         )
 
 
+_CREATE_WORKERS = 16
+
+# Implicit resources every client registers; the server already has them.
+_SKIP = {("user", "default_user"), ("provider", "local-mode")}
+
+
+def _ident(resource):
+    # The same for a resource and a reference to it.
+    return (resource._TYPE_NAME, resource.name, getattr(resource, "variant", None))
+
+# ResourceEnvelope oneof field for each resource type sent over CreateResourceStream.
+_ENVELOPE_FIELDS = {
+    "user": "user",
+    "provider": "provider",
+    "source": "source_variant",
+    "entity": "entity",
+    "feature": "feature_variant",
+    "label": "label_variant",
+    "training-set": "training_set_variant",
+    "schedule": "schedule_change",
+}
+
+
+class _StreamUnimplemented(Exception):
+    """The server predates CreateResourceStream."""
+
+
 class ResourceState:
 
     def __init__(self):
         self.__state = {}
         self.__create_list = []
+        self.__sorted = None
 
     @typechecked
     def add(self, resource: Resource) -> None:
         if hasattr(resource, 'variant'):
-            key = (resource.operation_type().name, resource.type(), resource.name, resource.variant)
+            key = (resource._OP_TYPE.name, resource._TYPE_NAME, resource.name, resource.variant)
         else:
-            key = (resource.operation_type().name, resource.type(), resource.name)
-        if key in self.__state:
-            if resource == self.__state[key]:
-                print(f"Resource {resource.type()} already registered.")
+            key = (resource._OP_TYPE.name, resource._TYPE_NAME, resource.name)
+        existing = self.__state.get(key)
+        if existing is not None:
+            # Re-adding the same object skips the field-by-field comparison.
+            if resource is existing or resource == existing:
+                print(f"Resource {resource._TYPE_NAME} already registered.")
                 return
             raise ResourceRedefinedError(resource)
         self.__state[key] = resource
         self.__create_list.append(resource)
+        self.__sorted = None
         if hasattr(resource, 'schedule_obj') and resource.schedule_obj != None:
             my_schedule = resource.schedule_obj
-            key = (my_schedule.type(),  my_schedule.name)
+            key = (my_schedule._TYPE_NAME,  my_schedule.name)
             self.__state[key] =  my_schedule
             self.__create_list.append(my_schedule)
 
     def sorted_list(self) -> List[Resource]:
-        resource_order = {
-            "user": 0,
-            "provider": 1,
-            "source": 2,
-            "entity": 3,
-            "feature": 4,
-            "label": 5,
-            "training-set": 6,
-            "schedule": 7,
-        }
-
-        def to_sort_key(res):
-            resource_num = resource_order[res.type()]
-            variant = res.variant if hasattr(res, "variant") else ""
-            return (resource_num, res.name, variant)
-
-        return sorted(self.__state.values(), key=to_sort_key)
+        if self.__sorted is None:
+            self.__sorted = sorted(self.__state.values(),
+                                   key=lambda res: (_RES_ORDER[res._TYPE_NAME], res.name, getattr(res, "variant", "")))
+        return list(self.__sorted)
 
     def create_all_local(self) -> None:
         db = SQLiteMetadata()
-        for resource in self.__create_list:
-            if resource.operation_type() is OperationType.GET:
-                print("Getting", resource.type(), resource.name)
-                resource._get_local(db)
-            if resource.operation_type() is OperationType.CREATE:
-                print("Creating", resource.type(), resource.name)
-                resource._create_local(db)
+        # Every resource created by one apply shares the same created stamp.
+        ts = str(time.time())
+        with db.batch():
+            for resource in self.__create_list:
+                if resource._OP_TYPE is OperationType.GET:
+                    print("Getting", resource._TYPE_NAME, resource.name)
+                    resource._get_local(db)
+                if resource._OP_TYPE is OperationType.CREATE:
+                    print("Creating", resource._TYPE_NAME, resource.name)
+                    resource._ts = ts
+                    resource._create_local(db)
         db.close()
         return
 
-    def create_all(self, stub) -> None:
+    def create_all(self, stub_pool) -> None:
+        gets = []
+        creates = []
         for resource in self.__create_list:
-            if resource.type() == "user" and resource.name == "default_user":
-                continue
-            if resource.type() == "provider" and resource.name == "local-mode":
+            if (resource._TYPE_NAME, resource.name) in _SKIP:
                 continue
-            try:
-                if resource.operation_type() is OperationType.GET:
-                    print("Getting", resource.type(), resource.name)
-                    resource._get(stub)
-                if resource.operation_type() is OperationType.CREATE:
-                    print("Creating", resource.type(), resource.name)
-                    resource._create(stub)
-            except grpc.RpcError as e:
-                if e.code() == grpc.StatusCode.ALREADY_EXISTS:
-                    print(resource.name, "already exists.")
+            if resource._OP_TYPE is OperationType.GET:
+                gets.append(resource)
+            elif resource._OP_TYPE is OperationType.CREATE:
+                creates.append(resource)
+        # A reference to a resource created in this same apply can only be
+        # resolved once the creates have run; other references are resolved
+        # first so a missing one fails before anything is created.
+        created = {_ident(resource) for resource in creates}
+        self.__get_all(stub_pool, [ref for ref in gets if _ident(ref) not in created])
+        if not creates:
+            return
+        try:
+            self.__create_stream(stub_pool.next(), creates)
+        except _StreamUnimplemented:
+            self.__create_tiers(stub_pool, creates)
+        self.__get_all(stub_pool, [ref for ref in gets if _ident(ref) in created])
+
+    @classmethod
+    def __create_tiers(cls, stub_pool, resources) -> None:
+        # Tiers run in _RES_ORDER so dependencies exist before their
+        # dependents; resources inside a tier are created concurrently.
+        tiers = {}
+        for resource in resources:
+            tiers.setdefault(_RES_ORDER[resource._TYPE_NAME], []).append(resource)
+        with ThreadPoolExecutor(max_workers=_CREATE_WORKERS) as executor:
+            for order in sorted(tiers):
+                tier = tiers[order]
+                if order == _RES_ORDER["source"]:
+                    # Transformations can read sources registered before them.
+                    for resource in tier:
+                        print(f"Creating {resource._TYPE_NAME} {resource.name}")
+                        cls.__create_unary(stub_pool.next(), resource)
                     continue
+                # Progress is printed here rather than from the workers so
+                # lines from concurrent creates don't interleave.
+                futures = []
+                for resource in tier:
+                    print(f"Creating {resource._TYPE_NAME} {resource.name}")
+                    futures.append(executor.submit(cls.__create_unary, stub_pool.next(), resource))
+                done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+                for future in not_done:
+                    future.cancel()
+                for future in done:
+                    future.result()
+
+    @staticmethod
+    def __get_all(stub_pool, resources) -> None:
+        # Each reference type is looked up over one stream, and the streams
+        # run in parallel across the pool's channels.
+        if not resources:
+            return
+        by_type = {}
+        for resource in resources:
+            print("Getting", resource._TYPE_NAME, resource.name)
+            by_type.setdefault(type(resource), []).append(resource)
+        with ThreadPoolExecutor(max_workers=len(stub_pool)) as executor:
+            list(executor.map(lambda refs: _get_references(stub_pool.next(), refs), by_type.values()))
+
+    @staticmethod
+    def __create_stream(stub, resources) -> None:
+        # Every create is pipelined over one CreateResourceStream call. The
+        # server answers each envelope in order and ends the stream on the
+        # first error other than ALREADY_EXISTS. The envelopes are built up
+        # front: gRPC consumes the request iterator on its own thread and
+        # hides any exception raised there, such as an unreadable
+        # credentials file.
+        envelopes = [pb.ResourceEnvelope(**{_ENVELOPE_FIELDS[resource._TYPE_NAME]: resource._proto()})
+                     for resource in resources]
+
+        import grpc
+        acked = 0
+        try:
+            for resource, ack in zip(resources, stub.CreateResourceStream(iter(envelopes))):
+                acked += 1
+                print(f"Creating {resource._TYPE_NAME} {resource.name}")
+                if ack.already_exists:
+                    print(resource.name, "already exists.")
+        except grpc.RpcError as e:
+            if acked == 0 and e.code() == grpc.StatusCode.UNIMPLEMENTED:
+                raise _StreamUnimplemented() from e
+            raise
 
-                raise
+    @staticmethod
+    def __create_unary(stub, resource) -> None:
+        import grpc
+        try:
+            resource._create(stub)
+        except grpc.RpcError as e:
+            if e.code() == grpc.StatusCode.ALREADY_EXISTS:
+                print(f"{resource.name} already exists.")
+                return
+            raise
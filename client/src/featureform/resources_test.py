@@ -2,10 +2,27 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+import builtins
+import dataclasses
+import inspect
+import json
+import os
+import pickle
+import sqlite3
+import subprocess
+import sys
+import threading
+
+import grpc
+import msgpack
 import pytest
+from featureform.proto import metadata_pb2 as pb
+from sqlite_metadata import SQLiteMetadata
+from tls import ChannelPool
 from resources import ResourceRedefinedError, ResourceState, Provider, RedisConfig, CassandraConfig, FirestoreConfig, \
 SnowflakeConfig, PostgresConfig, RedshiftConfig, BigQueryConfig, User, Provider, Entity, Feature, Label, TrainingSet, PrimaryData, SQLTable, \
-Source, ResourceColumnMapping, DynamodbConfig, Schedule
+Source, ResourceColumnMapping, DynamodbConfig, Schedule, LocalConfig, DFTransformation, EntityReference, \
+ProviderReference, SourceReference, _nv
 
 
 @pytest.fixture
@@ -494,4 +511,454 @@ def test_add_all_resources_with_schedule(all_resources_strange_order, redis_conf
                  variant="v1",
                  resource_type=6,
                  schedule_string="* * * * *"),
-    ]
\ No newline at end of file
+    ]
+
+def _construct_bad_redis_config(tmp_path, *flags, env=None):
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(inspect.getfile(RedisConfig))))
+    code = "from featureform.resources import RedisConfig; RedisConfig(host=1, port=1, password='', db=0)"
+    run_env = {k: v for k, v in os.environ.items() if k != "FEATUREFORM_NO_TYPECHECK"}
+    run_env.update(env or {}, PYTHONPATH=src_dir)
+    return subprocess.run([sys.executable, *flags, "-c", code], cwd=tmp_path, env=run_env, capture_output=True)
+
+
+@pytest.mark.parametrize("flags,env,checked", [
+    ((), None, True),
+    (("-O",), None, False),
+    ((), {"FEATUREFORM_NO_TYPECHECK": "1"}, False),
+    ((), {"FEATUREFORM_NO_TYPECHECK": "true"}, False),
+    ((), {"FEATUREFORM_NO_TYPECHECK": "0"}, True),
+    ((), {"FEATUREFORM_NO_TYPECHECK": "false"}, True),
+])
+def test_typecheck_toggle(tmp_path, flags, env, checked):
+    result = _construct_bad_redis_config(tmp_path, *flags, env=env)
+    if checked:
+        assert result.returncode != 0
+        assert b"TypeError" in result.stderr
+    else:
+        assert result.returncode == 0, result.stderr
+
+
+def test_local_mode_does_not_import_grpc(tmp_path):
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(inspect.getfile(RedisConfig))))
+    code = "import sys, featureform; featureform.Client(local=True); assert 'grpc' not in sys.modules"
+    env = dict(os.environ, PYTHONPATH=src_dir)
+    result = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, capture_output=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_config_serialize_is_memoized(redis_config):
+    serialized = redis_config.serialize()
+    assert isinstance(serialized, bytes)
+    assert redis_config.serialize() is serialized
+
+
+def test_configs_are_hashable(redis_config):
+    same_redis = RedisConfig(host="localhost", port=123, password="abc", db=3)
+    other_redis = RedisConfig(host="localhost", port=123, password="abc", db=4)
+    same_redis.serialize()
+    assert same_redis == redis_config
+    assert hash(same_redis) == hash(redis_config)
+    assert len({redis_config, same_redis, other_redis}) == 2
+
+
+def test_orjson_and_json_serialize_match(monkeypatch):
+    resources_module = sys.modules[RedisConfig.__module__]
+
+    def build_configs():
+        return [
+            RedisConfig(host="localhost", port=123, password="p\u00e4ss\"", db=3),
+            DynamodbConfig(region="abc", access_key="abc", secret_key="abc"),
+            SnowflakeConfig(account="act", database="db", organization="org", username="user", password="pwd",
+                            schema="schema"),
+        ]
+
+    fast = [json.loads(c.serialize()) for c in build_configs()]
+    monkeypatch.setattr(resources_module, "_dumps", resources_module._json_dumps)
+    slow = [json.loads(c.serialize()) for c in build_configs()]
+    assert fast == slow
+
+
+def test_dumps_falls_back_on_wide_ints():
+    resources_module = sys.modules[RedisConfig.__module__]
+    big = {"DB": 2 ** 70}
+    assert json.loads(resources_module._dumps(big)) == big
+
+
+def test_credentials_read_once_per_config(tmp_path, monkeypatch):
+    credentials_path = tmp_path / "credentials.json"
+    credentials_path.write_text('{"a": 1}')
+    opened = []
+    real_open = builtins.open
+
+    def counting_open(path, *args, **kwargs):
+        if str(path) == str(credentials_path):
+            opened.append(path)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "open", counting_open)
+    config = BigQueryConfig(project_id="p", dataset_id="d", credentials_path=str(credentials_path))
+    assert json.loads(config.serialize())["Credentials"] == {"a": 1}
+    config.serialize()
+    assert len(opened) == 1
+
+    credentials_path.write_text('{"a": 2}')
+    rotated = BigQueryConfig(project_id="p", dataset_id="d2", credentials_path=str(credentials_path))
+    assert json.loads(rotated.serialize())["Credentials"] == {"a": 2}
+    assert len(opened) == 2
+
+
+class FakeRpcError(grpc.RpcError):
+    def __init__(self, code):
+        self._code = code
+
+    def code(self):
+        return self._code
+
+
+class FakeStreamStub:
+    def __init__(self, acks=None, stream_error=None):
+        self.acks = acks
+        self.stream_error = stream_error
+        self.envelopes = []
+        self.unary = []
+
+    def CreateResourceStream(self, envelopes):
+        if self.stream_error is not None:
+            raise self.stream_error
+        for envelope, already_exists in zip(envelopes, self.acks):
+            self.envelopes.append(envelope)
+            yield pb.ResourceAck(already_exists=already_exists)
+
+    def CreateUser(self, user):
+        self.unary.append(user)
+
+    def CreateEntity(self, entity):
+        self.unary.append(entity)
+
+
+def _pool(stub, size=1):
+    return ChannelPool(lambda options: None, lambda channel: stub, size)
+
+
+def test_channel_pool_round_robins():
+    made = []
+
+    def make_channel(options):
+        made.append(options)
+        return len(made)
+
+    pool = ChannelPool(make_channel, lambda channel: channel, size=3)
+    assert len(pool) == 3
+    assert [pool.next() for _ in range(4)] == [1, 2, 3, 1]
+    assert all(("grpc.use_local_subchannel_pool", 1) in options for options in made)
+    with pytest.raises(ValueError):
+        ChannelPool(make_channel, lambda channel: channel, size=0)
+
+
+def test_create_all_streams_resources(capsys):
+    state = ResourceState()
+    state.add(User(name="Featureform"))
+    state.add(Entity(name="user", description="A user"))
+    stub = FakeStreamStub(acks=[False, True])
+    state.create_all(_pool(stub))
+    assert [e.WhichOneof("resource") for e in stub.envelopes] == ["user", "entity"]
+    assert stub.envelopes[1].entity.name == "user"
+    assert stub.unary == []
+    assert "user already exists." in capsys.readouterr().out
+
+
+def test_create_all_skips_implicit_resources():
+    state = ResourceState()
+    state.add(User(name="default_user"))
+    state.add(Provider(name="local-mode",
+                       function="ONLINE",
+                       description="",
+                       team="",
+                       config=LocalConfig()))
+    state.add(User(name="Featureform"))
+    stub = FakeStreamStub(acks=[False])
+    state.create_all(_pool(stub))
+    assert [e.user.name for e in stub.envelopes] == ["Featureform"]
+
+
+def test_create_all_falls_back_to_unary_calls(capsys):
+    state = ResourceState()
+    state.add(User(name="Featureform"))
+    state.add(Entity(name="user", description="A user"))
+    stub = FakeStreamStub(stream_error=FakeRpcError(grpc.StatusCode.UNIMPLEMENTED))
+    state.create_all(_pool(stub))
+    assert [m.name for m in stub.unary] == ["Featureform", "user"]
+    assert capsys.readouterr().out.splitlines() == ["Creating user Featureform", "Creating entity user"]
+
+
+def test_create_all_unary_progress_printed_by_caller(monkeypatch):
+    printed_from = []
+    real_print = builtins.print
+
+    def recording_print(*args, **kwargs):
+        if args and str(args[0]).startswith("Creating"):
+            printed_from.append(threading.current_thread())
+        real_print(*args, **kwargs)
+
+    monkeypatch.setattr(builtins, "print", recording_print)
+    state = ResourceState()
+    for name in ("a", "b", "c"):
+        state.add(Entity(name=name, description="An entity"))
+    stub = FakeStreamStub(stream_error=FakeRpcError(grpc.StatusCode.UNIMPLEMENTED))
+    state.create_all(_pool(stub, size=2))
+    assert printed_from == [threading.main_thread()] * 3
+
+
+def test_create_all_stream_error_is_raised():
+    state = ResourceState()
+    state.add(User(name="Featureform"))
+    stub = FakeStreamStub(stream_error=FakeRpcError(grpc.StatusCode.INTERNAL))
+    with pytest.raises(grpc.RpcError):
+        state.create_all(_pool(stub))
+
+
+class FailingEntityStub(FakeStreamStub):
+    def CreateEntity(self, entity):
+        raise FakeRpcError(grpc.StatusCode.INTERNAL)
+
+    def CreateFeatureVariant(self, feature):
+        self.unary.append(feature)
+
+
+def test_create_all_unary_tiers_stop_on_error():
+    state = ResourceState()
+    state.add(Feature(name="feature",
+                      variant="v1",
+                      source=("a", "b"),
+                      description="feature",
+                      value_type="float32",
+                      location=ResourceColumnMapping(entity="abc", value="def", timestamp="ts"),
+                      entity="user",
+                      owner="Owner",
+                      provider="redis-name"))
+    state.add(Entity(name="user", description="A user"))
+    state.add(User(name="Featureform"))
+    stub = FailingEntityStub(stream_error=FakeRpcError(grpc.StatusCode.UNIMPLEMENTED))
+    with pytest.raises(grpc.RpcError):
+        state.create_all(_pool(stub, size=2))
+    assert [m.name for m in stub.unary] == ["Featureform"]
+
+
+class FakeGetStub:
+    def __init__(self, known):
+        self.known = known
+        self.calls = []
+
+    def _lookup(self, requests):
+        sent = []
+        self.calls.append(sent)
+        for request in requests:
+            sent.append(request.name)
+            if request.name not in self.known:
+                raise FakeRpcError(grpc.StatusCode.NOT_FOUND)
+            yield pb.Entity(name=request.name)
+
+    GetEntities = _lookup
+    GetSourceVariants = _lookup
+
+
+def test_create_all_batches_reference_lookups():
+    state = ResourceState()
+    state.add(EntityReference(name="user", obj=None))
+    state.add(EntityReference(name="item", obj=None))
+    state.add(SourceReference(name="source", variant="v1", obj=None))
+    stub = FakeGetStub(known={"user", "item", "source"})
+    state.create_all(_pool(stub, size=2))
+    assert sorted(stub.calls) == [["source"], ["user", "item"]]
+    assert all(ref.obj.name == ref.name for ref in state.sorted_list())
+
+
+def test_create_all_reports_missing_reference():
+    state = ResourceState()
+    state.add(EntityReference(name="user", obj=None))
+    state.add(EntityReference(name="missing", obj=None))
+    with pytest.raises(ValueError, match="Entity missing not found."):
+        state.create_all(_pool(FakeGetStub(known={"user"})))
+
+
+class ApplyStub(FakeStreamStub):
+    # Consumes the request stream as gRPC does, hiding client-side errors.
+    def __init__(self):
+        super().__init__(acks=[False] * 8)
+
+    def CreateResourceStream(self, envelopes):
+        try:
+            envelopes = list(envelopes)
+        except Exception:
+            raise FakeRpcError(grpc.StatusCode.UNKNOWN)
+        return super().CreateResourceStream(envelopes)
+
+    def GetProviders(self, requests):
+        created = {envelope.provider.name for envelope in self.envelopes}
+        for request in requests:
+            if request.name not in created:
+                raise FakeRpcError(grpc.StatusCode.NOT_FOUND)
+            yield pb.Provider(name=request.name)
+
+
+def test_create_all_resolves_references_created_in_same_apply(redis_config):
+    state = ResourceState()
+    state.add(Provider(name="redis", function="ONLINE", description="", team="", config=redis_config))
+    reference = ProviderReference(name="redis", provider_type="redis", obj=None)
+    state.add(reference)
+    state.create_all(_pool(ApplyStub()))
+    assert reference.obj.name == "redis"
+
+
+def test_create_all_surfaces_client_side_errors():
+    config = BigQueryConfig(project_id="p", dataset_id="d", credentials_path="/nonexistent.json")
+    state = ResourceState()
+    state.add(Provider(name="bigquery", function="OFFLINE", description="", team="", config=config))
+    with pytest.raises(FileNotFoundError):
+        state.create_all(_pool(ApplyStub()))
+
+
+def test_readd_resource_is_ignored():
+    state = ResourceState()
+    user = User(name="Featureform")
+    state.add(user)
+    state.add(user)
+    state.add(User(name="Featureform"))
+    assert state.sorted_list() == [user]
+
+
+def test_sorted_list_tracks_adds():
+    state = ResourceState()
+    entity = Entity(name="user", description="A user")
+    user = User(name="Featureform")
+    state.add(entity)
+    assert state.sorted_list() == [entity]
+    state.add(user)
+    assert state.sorted_list() == [user, entity]
+
+
+def test_training_set_proto_features():
+    training_set = TrainingSet(name="training-set",
+                               variant="v1",
+                               description="desc",
+                               owner="featureform",
+                               label=("label", "var"),
+                               features=[("f1", "var"), ("f2", "var2")])
+    serialized = training_set._proto()
+    assert [(f.name, f.variant) for f in serialized.features] == [("f1", "var"), ("f2", "var2")]
+    assert (serialized.label.name, serialized.label.variant) == ("label", "var")
+
+
+def _local_feature(name):
+    return Feature(name=name,
+                   variant="v1",
+                   source=("a", "b"),
+                   description="feature",
+                   value_type="float32",
+                   location=ResourceColumnMapping(entity="abc", value="def", timestamp="ts"),
+                   entity="user",
+                   owner="Owner",
+                   provider="local-mode")
+
+
+def test_create_all_local_training_set(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    state = ResourceState()
+    state.add(_local_feature("f1"))
+    state.add(_local_feature("f2"))
+    state.add(Label(name="label",
+                    variant="v1",
+                    source=("a", "b"),
+                    description="label",
+                    value_type="bool",
+                    location=ResourceColumnMapping(entity="abc", value="def", timestamp="ts"),
+                    entity="user",
+                    owner="Owner",
+                    provider="local-mode"))
+    state.add(TrainingSet(name="training-set",
+                          variant="v1",
+                          description="desc",
+                          owner="featureform",
+                          label=("label", "v1"),
+                          features=[("f1", "v1"), ("f2", "v1")]))
+    state.create_all_local()
+    rows = SQLiteMetadata().get_training_set_features("training-set", "v1")
+    assert sorted(row["feature_name"] for row in rows) == ["f1", "f2"]
+
+
+def test_sqlite_batch_commits_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    db = SQLiteMetadata()
+    reader = sqlite3.connect(".featureform/SQLiteDB/metadata.db")
+    with db.batch():
+        db.insert_many("users", [("a", "User", "ready"), ("b", "User", "ready")])
+        db.insert("users", "c", "User", "ready")
+        assert reader.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 0
+    assert reader.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 3
+    reader.close()
+    db.close()
+
+
+def test_create_all_local_shares_created_stamp(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    state = ResourceState()
+    state.add(_local_feature("f1"))
+    state.add(_local_feature("f2"))
+    state.create_all_local()
+    db = SQLiteMetadata()
+    created = {db.get_feature_variant(name, "v1")["created"] for name in ("f1", "f2")}
+    assert len(created) == 1
+
+
+def test_create_all_local_packs_source_inputs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    state = ResourceState()
+    state.add(Source(name="transform",
+                     variant="v1",
+                     definition=DFTransformation(b"code", [("a", "b"), ("c", "d")]),
+                     owner="Owner",
+                     provider="local-mode",
+                     description="transformation"))
+    state.create_all_local()
+    inputs = SQLiteMetadata().get_source_variant("transform", "v1")["inputs"]
+    assert isinstance(inputs, bytes)
+    assert msgpack.unpackb(inputs) == [["a", "b"], ["c", "d"]]
+
+
+def test_local_config_serialize():
+    assert json.loads(LocalConfig().serialize()) == {}
+
+
+def test_slotted_resources_have_no_dict(redis_config):
+    redis_config.serialize()
+    feature = _local_feature("f1")
+    for resource in (redis_config, feature):
+        assert not hasattr(resource, "__dict__")
+        assert pickle.loads(pickle.dumps(resource)) == resource
+    with pytest.raises(AttributeError):
+        feature.not_a_field = 1
+
+
+def test_slotted_frozen_config_rejects_assignment(redis_config):
+    for name in ("host", "not_a_field"):
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            setattr(redis_config, name, "x")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            delattr(redis_config, name)
+
+
+def test_column_mapping_proto_is_cached():
+    mapping = ResourceColumnMapping(entity="abc", value="def", timestamp="ts")
+    columns = mapping.proto()
+    assert mapping.proto() is columns
+    assert (columns.entity, columns.value, columns.ts) == ("abc", "def", "ts")
+    assert _local_feature("f1")._proto().columns == _local_feature("f1").location.proto()
+
+
+def test_name_variant_messages_are_shared():
+    assert _nv("a", "b") is _nv("a", "b")
+    proto = _local_feature("f1")._proto()
+    assert (proto.source.name, proto.source.variant) == ("a", "b")
+    # The parent holds a copy, so editing it leaves the shared message alone.
+    proto.source.name = "changed"
+    assert _nv("a", "b").name == "a"
@@ -7,10 +7,9 @@ import os
 import random
 import types
 
-import grpc
+import msgpack
 import numpy as np
 from featureform.proto import serving_pb2
-from featureform.proto import serving_pb2_grpc
 from .tls import insecure_channel, secure_channel
 import pandas as pd
 from .sqlite_metadata import SQLiteMetadata
@@ -40,6 +39,8 @@ class HostedClientImpl:
                 'If not in local mode then `host` must be passed or the environment'
                 ' variable FEATUREFORM_HOST must be set.'
             )
+        # Imported here so local mode never loads gRPC.
+        from featureform.proto import serving_pb2_grpc
         channel = self._create_channel(host, insecure, cert_path)
         self._stub = serving_pb2_grpc.FeatureStub(channel)
 
@@ -85,7 +86,9 @@ class LocalClientImpl:
 
     def process_transformation(self, name, variant):
         source = self.db.get_source_variant(name, variant)
-        inputs = json.loads(source['inputs'])
+        inputs = source['inputs']
+        # Databases written before inputs were stored as msgpack hold JSON text.
+        inputs = json.loads(inputs) if isinstance(inputs, str) else msgpack.unpackb(inputs)
         dataframes = []
         code = marshal.loads(bytearray(source['definition']))
         func = types.FunctionType(code, globals(), "transformation")
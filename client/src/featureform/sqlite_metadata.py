@@ -1,4 +1,5 @@
 import sqlite3
+from contextlib import contextmanager
 from threading import Lock
 import sys
 import os
@@ -41,6 +42,7 @@ class SQLiteMetadata:
         raw_conn = sqlite3.connect(self.path + '/metadata.db', check_same_thread=False)
         raw_conn.row_factory = sqlite3.Row
         self.__conn = SyncSQLExecutor(raw_conn)
+        self.__batch = False
         self.createTables()
 
     def createTables(self):
@@ -113,7 +115,7 @@ class SQLiteMetadata:
           variant    text,
           status      text,
           transformation bool,
-          inputs text, 
+          inputs BLOB,
           definition  BLOB,
           PRIMARY KEY(name, variant),
           FOREIGN KEY(provider) REFERENCES providers(name),
@@ -188,13 +190,13 @@ class SQLiteMetadata:
     def get_type_table(self, type):
         query = f"SELECT * FROM {type}"
         type_data = self.__conn.execute(query)
-        self.__conn.commit()
+        self.__commit()
         return type_data.fetchall()
 
     def query_resource(self, type, column, resource):
         query = f"SELECT * FROM {type} WHERE {column}='{resource}';"
         variant_data = self.__conn.execute(query)
-        self.__conn.commit()
+        self.__commit()
         variant_data_list = variant_data.fetchall()
         if len(variant_data_list) == 0:
           raise ValueError(f"{type} with {column}: {resource} not found")
@@ -202,7 +204,7 @@ class SQLiteMetadata:
   
     def fetch_data(self, query, type, name, variant):
         variant_data = self.__conn.execute(query)
-        self.__conn.commit()
+        self.__commit()
         variant_data_list = variant_data.fetchall()
         if len(variant_data_list) == 0:
           raise ValueError(f"{type} with name: {name} and variant: {variant} not found")
@@ -298,7 +300,7 @@ class SQLiteMetadata:
     def is_transformation(self, name, variant):
         query = f"SELECT transformation FROM source_variant WHERE name='{name}' and variant='{variant}';"
         transformation = self.__conn.execute(query)
-        self.__conn.commit()
+        self.__commit()
         t = transformation.fetchall()
         if len(t) == 0:
             return 0
@@ -310,12 +312,35 @@ class SQLiteMetadata:
     def insert_source(self, tablename, *args):
         stmt = f"INSERT OR IGNORE INTO {tablename} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
         self.__conn.execute_stmt(stmt, args)
-        self.__conn.commit()
+        self.__commit()
 
     def insert(self, tablename, *args):
         query = f"INSERT OR IGNORE INTO {tablename} VALUES {str(args)}"
         self.__conn.execute(query)
-        self.__conn.commit()
+        self.__commit()
+
+    def insert_many(self, tablename, rows):
+        rows = list(rows)
+        if not rows:
+            return
+        placeholders = ", ".join("?" * len(rows[0]))
+        stmt = f"INSERT OR IGNORE INTO {tablename} VALUES ({placeholders})"
+        self.__conn.executemany(stmt, rows)
+        self.__commit()
+
+    @contextmanager
+    def batch(self):
+        """Defer commits until the block exits so its writes share one transaction."""
+        self.__batch = True
+        try:
+            yield self
+        finally:
+            self.__batch = False
+            self.__conn.commit()
+
+    def __commit(self):
+        if not self.__batch:
+            self.__conn.commit()
 
     def close(self):
         self.__conn.close()
\ No newline at end of file
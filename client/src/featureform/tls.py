@@ -1,17 +1,43 @@
-import grpc
+import itertools
 import os
+from threading import Lock
 
 
-def insecure_channel(host):
-    return grpc.insecure_channel(host, options=(('grpc.enable_http_proxy', 0),))
+def insecure_channel(host, options=()):
+    import grpc
+    return grpc.insecure_channel(host, options=(('grpc.enable_http_proxy', 0),) + tuple(options))
 
 
-def secure_channel(host, cert_path):
+def secure_channel(host, cert_path, options=()):
+    import grpc
     cert_path = cert_path or os.getenv('FEATUREFORM_CERT')
     if cert_path:
         with open(cert_path, 'rb') as f:
             credentials = grpc.ssl_channel_credentials(f.read())
     else:
         credentials = grpc.ssl_channel_credentials()
-    channel = grpc.secure_channel(host, credentials)
+    channel = grpc.secure_channel(host, credentials, options=tuple(options))
     return channel
+
+
+class ChannelPool:
+    """Round-robins stubs over several channels to the same host.
+
+    Each channel uses a local subchannel pool so it opens its own HTTP/2
+    connection instead of sharing gRPC's global one.
+    """
+
+    def __init__(self, make_channel, stub_class, size=4):
+        if size < 1:
+            raise ValueError("pool_size must be at least 1")
+        options = (('grpc.use_local_subchannel_pool', 1),)
+        self._stubs = [stub_class(make_channel(options)) for _ in range(size)]
+        self._cycle = itertools.cycle(self._stubs)
+        self._lock = Lock()
+
+    def next(self):
+        with self._lock:
+            return next(self._cycle)
+
+    def __len__(self):
+        return len(self._stubs)